@@ -1,18 +1,22 @@
 # billing_gui.py
-# GUI Supermarket Billing with basic DSA: Linked List + Hash Map + Min-Heap + Stack
+# GUI Supermarket Billing with basic DSA: Parallel Arrays + Hash Map + Min-Heap + Stack
 # Run: python billing_gui.py
+from array import array
+from bisect import bisect_left
+from collections import deque
 from dataclasses import dataclass
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import heapq
-from typing import Optional, Dict, List
+from operator import itemgetter
+from typing import Optional, Deque, Dict, Iterator, List
 
 
 # ----------------------------
 # Domain Models + DSA Structures
 # ----------------------------
-@dataclass
+@dataclass(slots=True)
 class Product:
     id: int
     name: str
@@ -20,110 +24,128 @@ class Product:
     quantity: int
 
 
-class Node:
-    """Singly linked list node for inventory order."""
-
-    def __init__(self, product: Product):
-        self.product = product
-        self.next: Optional["Node"] = None
-
-
 class Inventory:
     """
     Inventory backed by:
-      - Singly linked list (maintain insertion order / simple traversal)
-      - Hash map {id: Node} for O(1) lookup by id
-      - Min-heap of (quantity, id) for quick 'low stock' queries
+      - Hash map {id: row}: O(1) lookup by id; its insertion order is the inventory order
+      - Parallel arrays (names, prices, qtys) indexed by row
+      - Bounded heap selection (heapq.nsmallest) for 'low stock' queries
     """
 
     def __init__(self):
-        self.head: Optional[Node] = None
-        self.tail: Optional[Node] = None
-        self.index: Dict[int, Node] = {}
-        self._low_stock_heap: List[tuple[int, int]] = []  # (qty, id)
+        self.names: List[str] = []
+        self.prices = array("d")
+        self.qtys = array("q")
+        self.index: Dict[int, int] = {}  # id -> row
 
     def add_product(self, prod: Product) -> bool:
-        """Return False if id exists; True on success."""
+        """Return False if id exists; True on success.
+
+        Raises OverflowError (leaving the inventory unchanged) if the quantity
+        does not fit in 64 bits or the price does not fit in a double.
+        """
         if prod.id in self.index:
             return False
-        node = Node(prod)
-        if self.tail is None:
-            self.head = self.tail = node
-        else:
-            self.tail.next = node
-            self.tail = node
-        self.index[prod.id] = node
-        heapq.heappush(self._low_stock_heap, (prod.quantity, prod.id))
+        # Typed arrays can reject values, so fill them before the row is indexed
+        self.qtys.append(prod.quantity)
+        try:
+            self.prices.append(prod.price)
+        except OverflowError:
+            self.qtys.pop()
+            raise
+        self.names.append(prod.name)
+        self.index[prod.id] = len(self.names) - 1
         return True
 
-    def to_list(self) -> List[Product]:
-        out = []
-        cur = self.head
-        while cur:
-            out.append(cur.product)
-            cur = cur.next
-        return out
+    def iter_rows(self) -> Iterator[tuple[int, str, float, int]]:
+        """Yield (id, name, price, qty) rows in insertion order."""
+        # Rows are append-only, so the dict's key order matches row order
+        return zip(self.index, self.names, self.prices, self.qtys)
 
     def find(self, pid: int) -> Optional[Product]:
-        node = self.index.get(pid)
-        return node.product if node else None
+        """Return a snapshot of the product; change stock via update_quantity."""
+        row = self.index.get(pid)
+        if row is None:
+            return None
+        return Product(pid, self.names[row], self.prices[row], self.qtys[row])
 
     def update_quantity(self, pid: int, new_qty: int) -> None:
-        node = self.index.get(pid)
-        if not node:
+        row = self.index.get(pid)
+        if row is None:
             return
-        node.product.quantity = new_qty
-        # Push new snapshot to heap (lazy deletion)
-        heapq.heappush(self._low_stock_heap, (new_qty, pid))
+        self.qtys[row] = new_qty
 
     def k_lowest_stock(self, k: int = 5) -> List[Product]:
-        """Return k products with lowest stock (heap with lazy deletion)."""
-        results = []
-        seen = 0
-        popped = []
-        while self._low_stock_heap and seen < k:
-            qty, pid = heapq.heappop(self._low_stock_heap)
-            popped.append((qty, pid))
-            prod = self.find(pid)
-            if prod and prod.quantity == qty:
-                results.append(prod)
-                seen += 1
-        # Push back popped items
-        for item in popped:
-            heapq.heappush(self._low_stock_heap, item)
-        return results
+        """Return k products with lowest stock, ties by id (size-k heap over live rows)."""
+        return [Product(*row) for row in heapq.nsmallest(k, self.iter_rows(), key=itemgetter(3, 0))]
+
+
+UNDO_LIMIT = 50
+BILL_RULE = "-------------------------------------"
+HEADER_LINES = (
+    "=====================================",
+    " SUPERMARKET BILL ",
+    "=====================================",
+)
+FOOTER_TEMPLATE = "\n".join((
+    BILL_RULE,
+    f"{'Subtotal:':<24} ₹{{subtotal:>6.2f}}",
+    f"{'Discount:':<24} ₹{{discount:>6.2f}}",
+    BILL_RULE,
+    f"{'TOTAL:':<24} ₹{{total:>6.2f}}",
+    "",
+    "Thank you for shopping!",
+    "=====================================",
+))
+# Discount slabs: subtotal > 200 -> 5%, > 500 -> 10% (thresholds in paise)
+_DISCOUNT_THRESHOLDS = (20000, 50000)
+_DISCOUNT_RATES = (0.0, 0.05, 0.10)
+# Bound str.format methods parse their format spec once, not per call
+_bill_item = "{:<20} {:>3} ₹{:>6.2f} ₹{:>6.2f}".format
+
+
+def _to_paise(price: float) -> int:
+    """Round a rupee price to whole paise."""
+    return round(price * 100)
 
 
 class BillingSystem:
     """
     Billing logic:
       - Cart stored as {id: qty}
-      - Stack for undo actions
+      - Bounded stack (ring buffer) for undo actions
+      - Running subtotal kept in step with the cart, as exact integer paise
       - Discount slabs
     """
 
     def __init__(self, inventory: Inventory):
         self.inventory = inventory
         self.cart: Dict[int, int] = {}
-        self.undo_stack: List[tuple[str, int, int]] = []  # ("add", id, qty)
+        # ("add", id, qty); bounded so the oldest actions are evicted in long sessions
+        self.undo_stack: Deque[tuple[str, int, int]] = deque(maxlen=UNDO_LIMIT)
         self.customer_name: str = ""
         self.subtotal: float = 0.0
         self.discount: float = 0.0
+        self._subtotal_paise: int = 0
 
     def add_to_cart(self, pid: int, qty: int) -> str:
-        prod = self.inventory.find(pid)
-        if not prod:
+        inv = self.inventory
+        row = inv.index.get(pid)
+        if row is None:
             return "Product not found."
         if qty <= 0:
             return "Quantity should be positive."
-        if qty > prod.quantity:
+        stock = inv.qtys[row]
+        if qty > stock:
             return "Not enough stock available."
         # Update inventory and cart
-        prod.quantity -= qty
         self.cart[pid] = self.cart.get(pid, 0) + qty
-        self.inventory.update_quantity(pid, prod.quantity)
+        inv.qtys[row] = stock - qty
         self.undo_stack.append(("add", pid, qty))
-        return f"Added: {prod.name} x {qty} = Rs.{prod.price * qty:.2f}"
+        line_paise = _to_paise(inv.prices[row]) * qty
+        self._subtotal_paise += line_paise
+        self._recalc_discount()
+        return f"Added: {inv.names[row]} x {qty} = Rs.{line_paise / 100:.2f}"
 
     def undo_last(self) -> str:
         if not self.undo_stack:
@@ -131,62 +153,49 @@ class BillingSystem:
         action, pid, qty = self.undo_stack.pop()
         if action == "add":
             # Revert inventory and cart
-            prod = self.inventory.find(pid)
-            if not prod:
+            inv = self.inventory
+            row = inv.index.get(pid)
+            if row is None:
                 return "Unexpected error: product missing."
-            prod.quantity += qty
-            self.inventory.update_quantity(pid, prod.quantity)
-            self.cart[pid] -= qty
-            if self.cart[pid] <= 0:
-                self.cart.pop(pid, None)
-            return f"Undone: returned {qty} of {prod.name}."
+            inv.qtys[row] += qty
+            remaining = self.cart[pid] - qty
+            if remaining <= 0:
+                del self.cart[pid]
+            else:
+                self.cart[pid] = remaining
+            self._subtotal_paise -= _to_paise(inv.prices[row]) * qty
+            self._recalc_discount()
+            return f"Undone: returned {qty} of {inv.names[row]}."
         return "Unknown action."
 
-    def compute_totals(self) -> None:
-        self.subtotal = 0.0
-        for pid, qty in self.cart.items():
-            prod = self.inventory.find(pid)
-            if prod:
-                self.subtotal += prod.price * qty
-        # Discount slabs
-        if self.subtotal > 500:
-            self.discount = 0.10 * self.subtotal
-        elif self.subtotal > 200:
-            self.discount = 0.05 * self.subtotal
-        else:
-            self.discount = 0.0
+    def _recalc_discount(self) -> None:
+        # Slab lookup on exact paise; bisect_left keeps the thresholds exclusive
+        # (exactly 200 earns no discount)
+        paise = self._subtotal_paise
+        self.subtotal = paise / 100
+        self.discount = self.subtotal * _DISCOUNT_RATES[bisect_left(_DISCOUNT_THRESHOLDS, paise)]
 
     def checkout_summary(self) -> str:
-        self.compute_totals()
-        total = self.subtotal - self.discount
-        now = datetime.now()
-        date_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        lines = [
-            "=====================================",
-            " SUPERMARKET BILL ",
-            "=====================================",
-            f"Bill Date: {date_str}",
-            f"Customer: {self.customer_name}",
-            "",
-            "Item Qty Price Total",
-            "-------------------------------------"
-        ]
+        date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lines = list(HEADER_LINES)
+        lines.append(f"Bill Date: {date_str}")
+        lines.append(f"Customer: {self.customer_name}")
+        lines.extend(("", "Item Qty Price Total", BILL_RULE))
+        # Format lines and total them in one pass; the exact paise sum equals the
+        # running subtotal, so the bill always matches the totals labels
+        inv = self.inventory
+        subtotal_paise = 0
         for pid, qty in self.cart.items():
-            prod = self.inventory.find(pid)
-            if prod:
-                line_total = prod.price * qty
-                item_line = f"{prod.name[:20]:<20} {qty:>3} ₹{prod.price:>6.2f} ₹{line_total:>6.2f}"
-                lines.append(item_line)
-        lines.extend([
-            "-------------------------------------",
-            f"{'Subtotal:':<24} ₹{self.subtotal:>6.2f}",
-            f"{'Discount:':<24} ₹{self.discount:>6.2f}",
-            "-------------------------------------",
-            f"{'TOTAL:':<24} ₹{total:>6.2f}",
-            "",
-            "Thank you for shopping!",
-            "====================================="
-        ])
+            row = inv.index[pid]
+            price = inv.prices[row]
+            line_paise = _to_paise(price) * qty
+            subtotal_paise += line_paise
+            lines.append(_bill_item(inv.names[row][:20], qty, price, line_paise / 100))
+        self._subtotal_paise = subtotal_paise
+        self._recalc_discount()
+        subtotal, discount = self.subtotal, self.discount
+        lines.append(FOOTER_TEMPLATE.format(subtotal=subtotal, discount=discount,
+                                            total=subtotal - discount))
         return "\n".join(lines)
 
     def clear(self) -> None:
@@ -195,11 +204,37 @@ class BillingSystem:
         self.customer_name = ""
         self.subtotal = 0.0
         self.discount = 0.0
+        self._subtotal_paise = 0
 
 
 # ----------------------------
 # GUI
 # ----------------------------
+_money = "₹{:.2f}".format
+
+
+def _parse_int(var: tk.StringVar) -> Optional[int]:
+    """Parse an Entry's text as int; None if empty or invalid."""
+    s = var.get().strip()
+    if not s:
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+def _parse_float(var: tk.StringVar) -> Optional[float]:
+    """Parse an Entry's text as float; None if empty or invalid."""
+    s = var.get().strip()
+    if not s:
+        return None
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -293,6 +328,10 @@ class App(tk.Tk):
 
         self.inventory = Inventory()
         self.billing = BillingSystem(self.inventory)
+        self._dirty_ids: set[int] = set()  # inventory rows whose stock changed since last refresh
+        self._last_totals = (None, None, None)  # (subtotal, discount, total) currently on screen
+        self._refresh_pending = False
+        self._rebuild_inventory = False
         self._build_ui()
 
         # Status bar
@@ -424,14 +463,30 @@ class App(tk.Tk):
 
         self._refresh_cart_table_and_totals()
 
+    # ----- Refresh Scheduling -----
+    def _request_refresh(self, rebuild_inventory: bool = False):
+        """Coalesce table refreshes into one pass on the next idle cycle."""
+        self._rebuild_inventory |= rebuild_inventory
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._flush_refresh)
+
+    def _flush_refresh(self):
+        self._refresh_pending = False
+        if self._rebuild_inventory:
+            self._rebuild_inventory = False
+            self._refresh_inventory_table()
+        else:
+            self._refresh_inventory_rows()
+        self._refresh_cart_table_and_totals()
+
     # ----- Inventory Actions -----
     def _on_add_product(self):
-        try:
-            pid = int(self.pid_var.get().strip())
-            name = self.pname_var.get().strip()
-            price = float(self.price_var.get().strip())
-            qty = int(self.qty_var.get().strip())
-        except ValueError:
+        pid = _parse_int(self.pid_var)
+        name = self.pname_var.get().strip()
+        price = _parse_float(self.price_var)
+        qty = _parse_int(self.qty_var)
+        if pid is None or price is None or qty is None:
             messagebox.showerror("❌ Invalid Input", "Please enter valid ID, Price, and Quantity.")
             self.status_var.set("Error: Invalid input")
             return
@@ -443,13 +498,18 @@ class App(tk.Tk):
             messagebox.showerror("❌ Invalid Input", "Price and Quantity must be non-negative.")
             self.status_var.set("Error: Negative values")
             return
-        ok = self.inventory.add_product(Product(pid, name, price, qty))
+        try:
+            ok = self.inventory.add_product(Product(pid, name, price, qty))
+        except OverflowError:
+            messagebox.showerror("❌ Invalid Input", "Please enter valid ID, Price, and Quantity.")
+            self.status_var.set("Error: Invalid input")
+            return
         if not ok:
             messagebox.showerror("❌ Duplicate ID", f"Product ID {pid} already exists.")
             self.status_var.set("Error: Duplicate ID")
             return
         self._clear_inventory_form()
-        self._refresh_inventory_table()
+        self._request_refresh(rebuild_inventory=True)
         messagebox.showinfo("✅ Success", "Product added successfully!")
         self.status_var.set("Product added")
 
@@ -460,10 +520,22 @@ class App(tk.Tk):
         self.qty_var.set("")
 
     def _refresh_inventory_table(self):
-        for row in self.inv_table.get_children():
-            self.inv_table.delete(row)
-        for p in self.inventory.to_list():
-            self.inv_table.insert("", tk.END, values=(p.id, p.name, f"₹{p.price:.2f}", p.quantity))
+        children = self.inv_table.get_children()
+        if children:
+            self.inv_table.delete(*children)
+        rows = [(pid, name, _money(price), qty) for pid, name, price, qty in self.inventory.iter_rows()]
+        insert = self.inv_table.insert
+        for values in rows:
+            insert("", tk.END, iid=values[0], values=values)
+        self._dirty_ids.clear()
+
+    def _refresh_inventory_rows(self):
+        """Update in place only the rows marked dirty (stock changes)."""
+        inv = self.inventory
+        for pid in self._dirty_ids:
+            row = inv.index[pid]
+            self.inv_table.item(pid, values=(pid, inv.names[row], _money(inv.prices[row]), inv.qtys[row]))
+        self._dirty_ids.clear()
 
     def _on_show_low_stock(self):
         prods = self.inventory.k_lowest_stock(5)
@@ -478,17 +550,16 @@ class App(tk.Tk):
     # ----- Billing Actions -----
     def _on_add_to_cart(self):
         self.billing.customer_name = self.cust_var.get().strip()
-        try:
-            pid = int(self.scan_id_var.get().strip())
-            qty = int(self.scan_qty_var.get().strip())
-        except ValueError:
+        pid = _parse_int(self.scan_id_var)
+        qty = _parse_int(self.scan_qty_var)
+        if pid is None or qty is None:
             messagebox.showerror("❌ Invalid Input", "Enter valid Product ID and Quantity.")
             self.status_var.set("Error: Invalid scan input")
             return
         result = self.billing.add_to_cart(pid, qty)
         if result.startswith("Added"):
-            self._refresh_inventory_table()
-            self._refresh_cart_table_and_totals()
+            self._dirty_ids.add(pid)
+            self._request_refresh()
             self.scan_qty_var.set("")
             self.scan_id_var.set("")
             messagebox.showinfo("✅ Added to Cart", result)
@@ -498,29 +569,36 @@ class App(tk.Tk):
             self.status_var.set("Add failed")
 
     def _on_undo(self):
+        if self.billing.undo_stack:
+            self._dirty_ids.add(self.billing.undo_stack[-1][1])
         msg = self.billing.undo_last()
-        self._refresh_inventory_table()
-        self._refresh_cart_table_and_totals()
+        self._request_refresh()
         messagebox.showinfo("↩️ Undo Complete", msg)
         self.status_var.set("Last action undone")
 
     def _refresh_cart_table_and_totals(self):
-        for row in self.cart_table.get_children():
-            self.cart_table.delete(row)
-        subtotal = 0.0
+        children = self.cart_table.get_children()
+        if children:
+            self.cart_table.delete(*children)
+        inv = self.inventory
+        index, names, prices = inv.index, inv.names, inv.prices
+        rows = []
+        append = rows.append
         for pid, qty in self.billing.cart.items():
-            prod = self.inventory.find(pid)
-            if not prod:
-                continue
-            line_total = prod.price * qty
-            subtotal += line_total
-            self.cart_table.insert("", tk.END, values=(pid, prod.name, qty, f"₹{prod.price:.2f}", f"₹{line_total:.2f}"))
-        # update totals via billing logic for consistency
-        self.billing.compute_totals()
-        self.subtotal_var.set(f"₹{self.billing.subtotal:.2f}")
-        self.discount_var.set(f"₹{self.billing.discount:.2f}")
-        total = self.billing.subtotal - self.billing.discount
-        self.total_var.set(f"₹{total:.2f}")
+            row = index[pid]
+            price = prices[row]
+            append((pid, names[row], qty, _money(price), _money(price * qty)))
+        insert = self.cart_table.insert
+        for values in rows:
+            insert("", tk.END, values=values)
+        # totals are maintained by billing logic on every cart change
+        s, d = self.billing.subtotal, self.billing.discount
+        totals = (s, d, s - d)
+        if totals != self._last_totals:
+            self.subtotal_var.set(_money(s))
+            self.discount_var.set(_money(d))
+            self.total_var.set(_money(totals[2]))
+            self._last_totals = totals
 
     def _on_checkout(self):
         if not self.billing.cart:
@@ -531,7 +609,7 @@ class App(tk.Tk):
         messagebox.showinfo("💳 Checkout Bill", summary)
         # After showing the bill, keep inventory updated and clear only the cart
         self.billing.clear()
-        self._refresh_cart_table_and_totals()
+        self._request_refresh()
         self.cust_var.set("")
         self.scan_id_var.set("")
         self.scan_qty_var.set("")
@@ -542,11 +620,10 @@ class App(tk.Tk):
         for pid, qty in list(self.billing.cart.items()):
             prod = self.inventory.find(pid)
             if prod:
-                prod.quantity += qty
-                self.inventory.update_quantity(pid, prod.quantity)
+                self.inventory.update_quantity(pid, prod.quantity + qty)
+                self._dirty_ids.add(pid)
         self.billing.clear()
-        self._refresh_inventory_table()
-        self._refresh_cart_table_and_totals()
+        self._request_refresh()
         messagebox.showinfo("🗑️ Cart Cleared", "Cart has been cleared and stock restored.")
         self.status_var.set("Cart cleared")
 